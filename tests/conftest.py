@@ -2,7 +2,8 @@
 Shared pytest fixtures for pg-xpatch integration tests.
 
 Each test gets its own isolated PostgreSQL database with pg_xpatch installed.
-Databases are created/dropped automatically via the ``db`` fixture.
+Databases are created/dropped automatically via the ``db`` fixture, cloned
+from a per-worker template that already has the extension.
 
 Configuration via environment variables:
     PGHOST                  PostgreSQL host     (default: auto-detect from pg-xpatch-dev container)
@@ -25,17 +26,18 @@ Run tests:
 
 from __future__ import annotations
 
+import itertools
 import os
 import re
+import secrets
 import subprocess
-import uuid
 from pathlib import Path
 from typing import Any, Callable, Generator
 
 import psycopg
 import pytest
 from psycopg import sql
-from psycopg.rows import dict_row
+from psycopg.rows import dict_row, tuple_row
 
 
 # ---------------------------------------------------------------------------
@@ -48,6 +50,11 @@ CONTAINER_NAME = os.environ.get("PG_XPATCH_CONTAINER", "pg-xpatch-dev")
 CONNECT_TIMEOUT = 10
 STATEMENT_TIMEOUT_MS = 30_000  # 30 s — per-statement guard
 
+# Test database names: one random tag per process (distinct across xdist
+# workers) plus a counter, instead of a fresh UUID per test.
+_DB_NAME_TAG = secrets.token_hex(4)
+_db_name_seq = itertools.count(1)
+
 
 def _detect_container_ip(container: str = CONTAINER_NAME) -> str | None:
     """Try to get the IP of the dev container. Returns None on failure."""
@@ -126,6 +133,38 @@ def _admin_conn() -> psycopg.Connection:
     return psycopg.connect(**_pg_kwargs("postgres", statement_timeout=None))
 
 
+_shared_admin: psycopg.Connection | None = None
+
+
+def _admin_execute(query: Any) -> psycopg.Cursor[Any]:
+    """
+    Run *query* on this process's shared admin connection.
+
+    The connection is opened lazily and kept for the whole session, so the
+    per-test CREATE/DROP DATABASE calls don't each pay a connect/auth
+    handshake.  If the server went away (e.g. a crash test killed it) the
+    connection is reopened and the query retried once.
+    """
+    global _shared_admin
+    if _shared_admin is None or _shared_admin.closed or _shared_admin.broken:
+        _shared_admin = _admin_conn()
+    try:
+        return _shared_admin.execute(query)
+    except psycopg.OperationalError:
+        if not _shared_admin.broken:
+            raise
+    _shared_admin = _admin_conn()
+    return _shared_admin.execute(query)
+
+
+def _close_shared_admin() -> None:
+    """Close the shared admin connection, if one was opened."""
+    global _shared_admin
+    if _shared_admin is not None:
+        _shared_admin.close()
+        _shared_admin = None
+
+
 def _connect(
     dbname: str,
     *,
@@ -147,35 +186,52 @@ def _connect(
 # Database lifecycle helpers
 # ---------------------------------------------------------------------------
 
-def _create_database(name: str) -> None:
-    """Create a fresh database (fails loudly on name collision)."""
-    with _admin_conn() as conn:
-        ident = sql.Identifier(name)
-        conn.execute(sql.SQL("CREATE DATABASE {}").format(ident))
+def _create_database(name: str, *, template: str | None = None) -> None:
+    """
+    Create a fresh database (fails loudly on name collision).
+
+    With *template*, the new database is cloned from that database instead
+    of ``template1``; the template must have no open connections.
+    """
+    ident = sql.Identifier(name)
+    if template is None:
+        _admin_execute(sql.SQL("CREATE DATABASE {}").format(ident))
+    else:
+        _admin_execute(
+            sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                ident, sql.Identifier(template),
+            )
+        )
 
 
 def _drop_database(name: str) -> None:
     """Drop a database, force-terminating all connections (PG 13+)."""
     try:
-        with _admin_conn() as conn:
-            ident = sql.Identifier(name)
-            conn.execute(
-                sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(ident)
-            )
+        ident = sql.Identifier(name)
+        _admin_execute(
+            sql.SQL("DROP DATABASE IF EXISTS {} WITH (FORCE)").format(ident)
+        )
     except Exception:
         pass  # best-effort — orphan cleanup will catch leftovers
 
 
-def _drop_orphans() -> None:
-    """Drop all ``xptest_*`` databases (leftovers from crashed runs)."""
+def _drop_orphans(prefix: str = "xptest_") -> None:
+    """
+    Drop all databases whose name starts with *prefix* (crashed-run leftovers).
+
+    The default sweeps per-test ``xptest_*`` databases.  ``xptmpl_*``
+    templates are swept separately by ``pytest_sessionfinish`` on the xdist
+    controller (or the lone process without xdist), once no worker can
+    still be cloning from them.
+    """
     try:
-        with _admin_conn() as conn:
-            rows = conn.execute(
-                "SELECT datname FROM pg_database WHERE datname LIKE 'xptest_%'"
-            ).fetchall()
-            for row in rows:
-                name = row[0] if isinstance(row, tuple) else row["datname"]
-                _drop_database(name)
+        rows = _admin_execute(
+            sql.SQL("SELECT datname FROM pg_database WHERE datname LIKE {}").format(
+                sql.Literal(prefix + "%"),
+            )
+        ).fetchall()
+        for row in rows:
+            _drop_database(row[0])
     except Exception:
         pass
 
@@ -255,10 +311,12 @@ def row_count(
     where: str = "",
 ) -> int:
     """Return ``SELECT COUNT(*)`` for *table*, with an optional WHERE clause."""
-    q = sql.SQL("SELECT COUNT(*) AS n FROM {}").format(sql.Identifier(table))
+    q = sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(table))
     if where:
         q = sql.SQL("{} WHERE {}").format(q, sql.SQL(where))
-    return conn.execute(q).fetchone()["n"]  # type: ignore[index]
+    # Scalar read: skip building a dict_row for a single column.
+    with conn.cursor(row_factory=tuple_row) as cur:
+        return cur.execute(q).fetchone()[0]  # type: ignore[index]
 
 
 def insert_rows(
@@ -344,8 +402,7 @@ def _check_postgres(request: pytest.FixtureRequest) -> None:
     if worker_id not in ("master", "gw0"):
         return
     try:
-        with _admin_conn() as conn:
-            conn.execute("SELECT 1")
+        _admin_execute("SELECT 1")
     except Exception as exc:
         pytest.exit(
             f"Cannot connect to PostgreSQL at {PG_HOST}:{PG_PORT} "
@@ -361,6 +418,7 @@ def _cleanup_orphaned_databases(request: pytest.FixtureRequest) -> Generator[Non
 
     Only the controller / first xdist worker performs cleanup to avoid
     race conditions where one worker drops another worker's active database.
+    Every worker closes its shared admin connection at the end.
     """
     worker_id = _get_worker_id(request)
     if worker_id in ("master", "gw0"):
@@ -368,6 +426,31 @@ def _cleanup_orphaned_databases(request: pytest.FixtureRequest) -> Generator[Non
     yield
     if worker_id in ("master", "gw0"):
         _drop_orphans()
+    _close_shared_admin()
+
+
+@pytest.fixture(scope="session")
+def _xpatch_template(request: pytest.FixtureRequest) -> Generator[str, None, None]:
+    """
+    Per-worker template database with pg_xpatch already installed.
+
+    ``db`` clones it with ``CREATE DATABASE ... TEMPLATE`` so the extension
+    script runs once per worker instead of once per test.  The ``xptmpl_``
+    prefix keeps it out of the ``xptest_*`` orphan sweep, which another
+    worker may run while this one is still cloning from it.
+    """
+    name = f"xptmpl_{_get_worker_id(request)}"
+    _drop_database(name)  # leftover from a crashed run
+    _create_database(name)
+
+    conn = _connect(name)
+    try:
+        conn.execute("CREATE EXTENSION IF NOT EXISTS pg_xpatch")
+    finally:
+        conn.close()
+
+    yield name
+    _drop_database(name)
 
 
 # ---------------------------------------------------------------------------
@@ -375,24 +458,26 @@ def _cleanup_orphaned_databases(request: pytest.FixtureRequest) -> Generator[Non
 # ---------------------------------------------------------------------------
 
 @pytest.fixture()
-def db() -> Generator[psycopg.Connection, None, None]:
+def db(_xpatch_template: str) -> Generator[psycopg.Connection, None, None]:
     """
     Fresh, isolated database with pg_xpatch installed.
 
     Behaviour:
-    - Unique UUID-based name — safe under pytest-xdist parallelism.
+    - Cloned from the per-worker ``_xpatch_template`` database, so the
+      extension is already installed when the test starts.
+    - Unique name (per-process random tag + counter) — safe under
+      pytest-xdist parallelism.
     - ``autocommit=True`` — each statement is immediately visible.
       Use ``with conn.transaction():`` when you need explicit transactions.
     - ``row_factory=dict_row`` — rows come back as dicts, e.g. ``row["col"]``.
     - ``statement_timeout=30s`` — guards against infinite loops in the C extension.
     - Database is dropped (WITH FORCE) after the test regardless of outcome.
     """
-    db_name = f"xptest_{uuid.uuid4().hex[:12]}"
-    _create_database(db_name)
+    db_name = f"xptest_{_DB_NAME_TAG}_{next(_db_name_seq)}"
+    _create_database(db_name, template=_xpatch_template)
 
     conn = _connect(db_name)
     try:
-        conn.execute("CREATE EXTENSION IF NOT EXISTS pg_xpatch")
         yield conn
     finally:
         conn.close()
@@ -450,6 +535,11 @@ def db_factory(db: psycopg.Connection) -> Generator[Callable[[], psycopg.Connect
 # Convenience fixtures
 # ---------------------------------------------------------------------------
 
+# Statement templates used by make_table, built once at import.
+_CREATE_XPATCH_TABLE = sql.SQL("CREATE TABLE {} ({}) USING xpatch")
+_CONFIGURE_XPATCH = sql.SQL("SELECT xpatch.configure({}, {})")
+
+
 @pytest.fixture()
 def make_table(db: psycopg.Connection) -> Callable[..., str]:
     """
@@ -472,6 +562,8 @@ def make_table(db: psycopg.Connection) -> Callable[..., str]:
             t = make_table()  # (group_id INT, version INT, content TEXT)
     """
     created: list[str] = []
+    # Names only need to be unique within this test's private database.
+    seq = itertools.count(1)
 
     def _make(
         columns: str = "group_id INT, version INT, content TEXT NOT NULL",
@@ -483,14 +575,10 @@ def make_table(db: psycopg.Connection) -> Callable[..., str]:
         compress_depth: int | None = None,
         enable_zstd: bool | None = None,
     ) -> str:
-        name = f"test_{uuid.uuid4().hex[:8]}"
+        name = f"test_{next(seq)}"
         ident = sql.Identifier(name)
 
-        db.execute(
-            sql.SQL("CREATE TABLE {} ({}) USING xpatch").format(
-                ident, sql.SQL(columns),
-            )
-        )
+        db.execute(_CREATE_XPATCH_TABLE.format(ident, sql.SQL(columns)))
 
         # Build xpatch.configure() call
         config_parts = [
@@ -516,7 +604,7 @@ def make_table(db: psycopg.Connection) -> Callable[..., str]:
             )
 
         db.execute(
-            sql.SQL("SELECT xpatch.configure({}, {})").format(
+            _CONFIGURE_XPATCH.format(
                 sql.Literal(name),
                 sql.SQL(", ").join(config_parts),
             )
@@ -625,3 +713,18 @@ def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
             normal.append(item)
 
     items[:] = normal + stress + crash
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """
+    Drop every ``xptmpl_*`` template database once the whole run is over.
+
+    Each worker drops its own template during fixture teardown, but a
+    killed run leaves them behind, and a later run with fewer workers never
+    reuses names like ``xptmpl_gw7``.  Only the xdist controller (or the
+    single process without xdist) sweeps, after all workers have finished.
+    """
+    if hasattr(session.config, "workerinput"):
+        return
+    _drop_orphans("xptmpl_")
+    _close_shared_admin()